@@ -94,12 +94,32 @@ def cast_to_device(self, verbose=False):
         expected_gb = expected_bytes / 1024.0**3.0
         print(f"# {self.__class__.__name__}: expected to allocate {expected_gb} GB")
 
+    # Stage all host arrays of a given dtype in one pinned buffer and move
+    # them in a single H2D transfer instead of one copy per attribute; the
+    # attributes become views into the one device allocation.
+    groups = {}
     for k, v in self.__dict__.items():
         if isinstance(v, _np.ndarray):
-            self.__dict__[k] = arraylib.array(v)
+            groups.setdefault(v.dtype, []).append(k)
         elif isinstance(v, list) and isinstance(v[0], _np.ndarray):
             self.__dict__[k] = [arraylib.array(vi) for vi in v]
 
+    for dtype, names in groups.items():
+        nelem = sum(self.__dict__[k].size for k in names)
+        staging = _cp.cuda.alloc_pinned_memory(nelem * dtype.itemsize)
+        host = _np.frombuffer(staging, dtype=dtype, count=nelem)
+        offset = 0
+        for k in names:
+            v = self.__dict__[k]
+            host[offset : offset + v.size] = v.ravel()
+            offset += v.size
+        device = _cp.asarray(host)
+        offset = 0
+        for k in names:
+            v = self.__dict__[k]
+            self.__dict__[k] = device[offset : offset + v.size].reshape(v.shape)
+            offset += v.size
+
     used_bytes, total_bytes = get_device_memory()
     used_gb, total_gb = used_bytes / 1024**3.0, total_bytes / 1024**3.0
     if verbose:
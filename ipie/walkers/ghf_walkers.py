@@ -18,6 +18,7 @@
 
 import numpy
 import plum
+import scipy.linalg
 
 from ipie.config import config
 from ipie.utils.backend import arraylib as xp
@@ -57,6 +58,7 @@ class GHFWalkers(BaseWalkers):
         self.G[:, : self.nbasis, : self.nbasis] = walkers.Ga
         self.G[:, self.nbasis :, self.nbasis :] = walkers.Gb
         self.Ghalf = None
+        self._qr_lwork = None
 
     @plum.dispatch
     def __init__(
@@ -80,10 +82,7 @@ class GHFWalkers(BaseWalkers):
         # should completely deprecate these
         self.field_configs = None
 
-        self.phi = numpy.array(
-            [initial_walker.copy() for iw in range(self.nwalkers)],
-            dtype=numpy.complex128,
-        )
+        self.phi = numpy.tile(initial_walker.astype(numpy.complex128), (self.nwalkers, 1, 1))
 
         # will be built only on request
         self.G = numpy.zeros(
@@ -96,6 +95,8 @@ class GHFWalkers(BaseWalkers):
         self.buff_size = round(self.set_buff_size_single_walker() / float(self.nwalkers))
         self.walker_buffer = numpy.zeros(self.buff_size, dtype=numpy.complex128)
 
+        self._qr_lwork = None
+
     def build(self, trial):
         self.ovlp = trial.calc_greens_function(self)
 
@@ -111,30 +112,42 @@ class GHFWalkers(BaseWalkers):
         """
         if config.get_option("use_gpu"):
             return self.reortho_batched()
-        detR = []
+        if self._qr_lwork is None:
+            # workspace query is the same for every walker so do it once
+            (geqrf_lwork,) = scipy.linalg.get_lapack_funcs(
+                ("geqrf_lwork",), dtype=numpy.complex128
+            )
+            lwork, _ = geqrf_lwork(*self.phi[0].shape)
+            self._qr_lwork = int(lwork.real)
+        log_det = xp.empty(self.nwalkers, dtype=xp.float64)
         for iw in range(self.nwalkers):
-            (self.phi[iw], R) = qr(self.phi[iw], mode=qr_mode)
+            (self.phi[iw], R) = scipy.linalg.qr(
+                self.phi[iw],
+                mode="economic",
+                overwrite_a=True,
+                check_finite=False,
+                lwork=self._qr_lwork,
+            )
             # TODO: FDM This isn't really necessary, the absolute value of the
             # weight is used for population control so this shouldn't matter.
             # I think this is a legacy thing.
             # Wanted detR factors to remain positive, dump the sign in orbitals.
             R_diag = xp.diag(R)
             signs = xp.sign(R_diag)
-            self.phi[iw] = xp.dot(self.phi[iw], xp.diag(signs))
+            self.phi[iw] *= signs[numpy.newaxis, :]
 
             # include overlap factor
             # det(R) = \prod_ii R_ii
             # det(R) = exp(log(det(R))) = exp((sum_i log R_ii) - C)
             # C factor included to avoid over/underflow
-            log_det = xp.sum(xp.log(xp.abs(R_diag)))
+            log_det[iw] = xp.sum(xp.log(xp.abs(R_diag)))
 
-            detR += [xp.exp(log_det - self.detR_shift[iw])]
-            self.log_detR[iw] += xp.log(detR[iw])
-            self.detR[iw] = detR[iw]
-            self.ovlp[iw] = self.ovlp[iw] / detR[iw]
+        self.detR = xp.exp(log_det - self.detR_shift)
+        self.log_detR = self.log_detR + (log_det - self.detR_shift)
+        self.ovlp = self.ovlp / self.detR
 
         synchronize()
-        return detR
+        return self.detR
 
     def reortho_batched(self):
         """reorthogonalise walkers.
@@ -145,7 +158,7 @@ class GHFWalkers(BaseWalkers):
         assert config.get_option("use_gpu")
         (self.phi, Rup) = qr(self.phi, mode=qr_mode)
         Rup_diag = xp.einsum("wii->wi", Rup)
-        log_det = xp.einsum("wi->w", xp.log(abs(Rup_diag)))
+        log_det = xp.log(xp.abs(Rup_diag)).sum(axis=1)
         self.detR = xp.exp(log_det - self.detR_shift)
         self.ovlp = self.ovlp / self.detR
 
@@ -23,6 +23,27 @@ from ipie.utils.backend import arraylib as xp
 from ipie.utils.backend import cast_to_device, qr, qr_mode, synchronize
 from ipie.walkers.base_walkers import BaseWalkers
 
+if config.get_option("use_gpu"):
+    try:
+        # pylint: disable=import-error
+        import cupy
+
+        # Single fused pass over the stacked R diagonals producing both
+        # log|R_ii| and the phase factor, instead of separate diagonal
+        # extraction, abs/log and sign kernel launches.
+        _reortho_post = cupy.ElementwiseKernel(
+            "complex128 rdiag",
+            "float64 logabs, complex128 sign",
+            """
+            double a = abs(rdiag);
+            logabs = log(a);
+            sign = (a == 0.0) ? complex<double>(1.0, 0.0) : rdiag / a;
+            """,
+            "reortho_post",
+        )
+    except ModuleNotFoundError:
+        pass
+
 
 class UHFWalkers(BaseWalkers):
     """UHF style walker.
@@ -54,31 +75,31 @@ class UHFWalkers(BaseWalkers):
         # should completely deprecate these
         self.field_configs = None
 
-        self.phia = numpy.array(
-            [initial_walker[:, : self.nup].copy() for iw in range(self.nwalkers)],
-            dtype=numpy.complex128,
-        )
-        self.phib = numpy.array(
-            [initial_walker[:, self.nup :].copy() for iw in range(self.nwalkers)],
-            dtype=numpy.complex128,
-        )
+        # allocate through xp so GPU runs place the walker arrays directly on
+        # device instead of staging full-size host copies for cast_to_cupy
+        self.phia = xp.broadcast_to(
+            xp.asarray(initial_walker[:, : self.nup], dtype=xp.complex128),
+            (self.nwalkers, self.nbasis, self.nup),
+        ).copy()
+        self.phib = xp.broadcast_to(
+            xp.asarray(initial_walker[:, self.nup :], dtype=xp.complex128),
+            (self.nwalkers, self.nbasis, self.ndown),
+        ).copy()
 
         # will be built only on request
-        self.Ga = numpy.zeros(
+        self.Ga = xp.zeros(
             shape=(self.nwalkers, self.nbasis, self.nbasis),
-            dtype=numpy.complex128,
+            dtype=xp.complex128,
         )
-        self.Gb = numpy.zeros(
+        self.Gb = xp.zeros(
             shape=(self.nwalkers, self.nbasis, self.nbasis),
-            dtype=numpy.complex128,
+            dtype=xp.complex128,
         )
 
-        self.Ghalfa = numpy.zeros(
-            shape=(self.nwalkers, self.nup, self.nbasis), dtype=numpy.complex128
-        )
-        self.Ghalfb = numpy.zeros(
+        self.Ghalfa = xp.zeros(shape=(self.nwalkers, self.nup, self.nbasis), dtype=xp.complex128)
+        self.Ghalfb = xp.zeros(
             shape=(self.nwalkers, self.ndown, self.nbasis),
-            dtype=numpy.complex128,
+            dtype=xp.complex128,
         )
 
         self.buff_names += ["phia", "phib"]
@@ -103,38 +124,34 @@ class UHFWalkers(BaseWalkers):
         """
         if config.get_option("use_gpu"):
             return self.reortho_batched()
-        ndown = self.ndown
-        detR = []
-        for iw in range(self.nwalkers):
-            (self.phia[iw], Rup) = qr(self.phia[iw], mode=qr_mode)
-            # TODO: FDM This isn't really necessary, the absolute value of the
-            # weight is used for population control so this shouldn't matter.
-            # I think this is a legacy thing.
-            # Wanted detR factors to remain positive, dump the sign in orbitals.
-            Rup_diag = xp.diag(Rup)
-            signs_up = xp.sign(Rup_diag)
-            self.phia[iw] = xp.dot(self.phia[iw], xp.diag(signs_up))
-
-            # include overlap factor
-            # det(R) = \prod_ii R_ii
-            # det(R) = exp(log(det(R))) = exp((sum_i log R_ii) - C)
-            # C factor included to avoid over/underflow
-            log_det = xp.sum(xp.log(xp.abs(Rup_diag)))
-
-            if ndown > 0:
-                (self.phib[iw], Rdn) = qr(self.phib[iw], mode=qr_mode)
-                Rdn_diag = xp.diag(Rdn)
-                signs_dn = xp.sign(Rdn_diag)
-                self.phib[iw] = xp.dot(self.phib[iw], xp.diag(signs_dn))
-                log_det += sum(xp.log(abs(Rdn_diag)))
-
-            detR += [xp.exp(log_det - self.detR_shift[iw])]
-            self.log_detR[iw] += xp.log(detR[iw])
-            self.detR[iw] = detR[iw]
-            self.ovlp[iw] = self.ovlp[iw] / detR[iw]
+        (self.phia, Rup) = numpy.linalg.qr(self.phia)
+        Rup_diag = numpy.einsum("wii->wi", Rup)
+        # TODO: FDM This isn't really necessary, the absolute value of the
+        # weight is used for population control so this shouldn't matter.
+        # I think this is a legacy thing.
+        # Wanted detR factors to remain positive, dump the sign in orbitals.
+        signs_up = numpy.sign(Rup_diag)
+        self.phia = self.phia * signs_up[:, numpy.newaxis, :]
+
+        # include overlap factor
+        # det(R) = \prod_ii R_ii
+        # det(R) = exp(log(det(R))) = exp((sum_i log R_ii) - C)
+        # C factor included to avoid over/underflow
+        log_det = numpy.log(numpy.abs(Rup_diag)).sum(axis=1)
+
+        if self.ndown > 0:
+            (self.phib, Rdn) = numpy.linalg.qr(self.phib)
+            Rdn_diag = numpy.einsum("wii->wi", Rdn)
+            signs_dn = numpy.sign(Rdn_diag)
+            self.phib = self.phib * signs_dn[:, numpy.newaxis, :]
+            log_det += numpy.log(numpy.abs(Rdn_diag)).sum(axis=1)
+
+        self.detR = numpy.exp(log_det - self.detR_shift)
+        self.log_detR = self.log_detR + numpy.log(self.detR)
+        self.ovlp = self.ovlp / self.detR
 
         synchronize()
-        return detR
+        return self.detR
 
     def reortho_batched(self):
         """reorthogonalise walkers.
@@ -144,13 +161,20 @@ class UHFWalkers(BaseWalkers):
         """
         assert config.get_option("use_gpu")
         (self.phia, Rup) = qr(self.phia, mode=qr_mode)
-        Rup_diag = xp.einsum("wii->wi", Rup)
-        log_det = xp.einsum("wi->w", xp.log(abs(Rup_diag)))
+        # strided view of the stacked diagonals
+        Rup_diag = Rup.reshape(self.nwalkers, -1)[:, :: self.nup + 1]
+        log_abs_up, signs_up = _reortho_post(Rup_diag)
+        # as in the CPU path, keep detR positive and push the phase into the
+        # orbitals
+        self.phia *= signs_up[:, xp.newaxis, :]
+        log_det = log_abs_up.sum(axis=1)
 
         if self.ndown > 0:
             (self.phib, Rdn) = qr(self.phib, mode=qr_mode)
-            Rdn_diag = xp.einsum("wii->wi", Rdn)
-            log_det += xp.einsum("wi->w", xp.log(abs(Rdn_diag)))
+            Rdn_diag = Rdn.reshape(self.nwalkers, -1)[:, :: self.ndown + 1]
+            log_abs_dn, signs_dn = _reortho_post(Rdn_diag)
+            self.phib *= signs_dn[:, xp.newaxis, :]
+            log_det += log_abs_dn.sum(axis=1)
 
         self.detR = xp.exp(log_det - self.detR_shift)
         self.ovlp = self.ovlp / self.detR
@@ -196,21 +220,21 @@ class UHFWalkersParticleHole(UHFWalkers):
                     self.ovlp.real
                 )
             )
-        self.G0a = numpy.zeros(
+        self.G0a = xp.zeros(
             shape=(self.nwalkers, self.nbasis, self.nbasis),
-            dtype=numpy.complex128,
+            dtype=xp.complex128,
         )  # reference 1-GF
-        self.G0b = numpy.zeros(
+        self.G0b = xp.zeros(
             shape=(self.nwalkers, self.nbasis, self.nbasis),
-            dtype=numpy.complex128,
+            dtype=xp.complex128,
         )  # reference 1-GF
-        self.Q0a = numpy.zeros(
+        self.Q0a = xp.zeros(
             shape=(self.nwalkers, self.nbasis, self.nbasis),
-            dtype=numpy.complex128,
+            dtype=xp.complex128,
         )  # reference 1-GF
-        self.Q0b = numpy.zeros(
+        self.Q0b = xp.zeros(
             shape=(self.nwalkers, self.nbasis, self.nbasis),
-            dtype=numpy.complex128,
+            dtype=xp.complex128,
         )  # reference 1-GF
 
     def build(self, trial):
@@ -301,32 +325,14 @@ class UHFWalkersParticleHoleNaive(UHFWalkersParticleHole):
         self.det_ovlpas = numpy.zeros((self.nwalkers, self.num_dets), dtype=numpy.complex128)
         self.det_ovlpbs = numpy.zeros((self.nwalkers, self.num_dets), dtype=numpy.complex128)
 
-        self.Gia = numpy.zeros(
-            shape=(
-                self.nwalkers,
-                self.num_dets,
-                self.nbasis,
-                self.nbasis,
-            ),
-            dtype=numpy.complex128,
-        )
-        self.Gib = numpy.zeros(
-            shape=(
-                self.nwalkers,
-                self.num_dets,
-                self.nbasis,
-                self.nbasis,
-            ),
-            dtype=numpy.complex128,
-        )
-        self.Gihalfa = numpy.zeros(
-            shape=(self.nwalkers, self.num_dets, self.nup, self.nbasis),
-            dtype=numpy.complex128,
-        )
-        self.Gihalfb = numpy.zeros(
-            shape=(self.nwalkers, self.num_dets, self.ndown, self.nbasis),
-            dtype=numpy.complex128,
-        )
+        # The determinant-resolved Green's functions scale as
+        # nwalkers * ndets * nbasis^2 and can run to many GB for large
+        # expansions, so they are allocated on first access rather than
+        # eagerly here.
+        self._Gia = None
+        self._Gib = None
+        self._Gihalfa = None
+        self._Gihalfb = None
         self.CIa = numpy.zeros(
             shape=(self.nwalkers, self.nbasis, self.nbasis),
             dtype=numpy.complex128,
@@ -336,3 +342,55 @@ class UHFWalkersParticleHoleNaive(UHFWalkersParticleHole):
             dtype=numpy.complex128,
         )
         self.ovlp = trial.calc_greens_function(self)
+
+    @property
+    def Gia(self):
+        if self._Gia is None:
+            self._Gia = numpy.zeros(
+                shape=(self.nwalkers, self.num_dets, self.nbasis, self.nbasis),
+                dtype=numpy.complex128,
+            )
+        return self._Gia
+
+    @Gia.setter
+    def Gia(self, value):
+        self._Gia = value
+
+    @property
+    def Gib(self):
+        if self._Gib is None:
+            self._Gib = numpy.zeros(
+                shape=(self.nwalkers, self.num_dets, self.nbasis, self.nbasis),
+                dtype=numpy.complex128,
+            )
+        return self._Gib
+
+    @Gib.setter
+    def Gib(self, value):
+        self._Gib = value
+
+    @property
+    def Gihalfa(self):
+        if self._Gihalfa is None:
+            self._Gihalfa = numpy.zeros(
+                shape=(self.nwalkers, self.num_dets, self.nup, self.nbasis),
+                dtype=numpy.complex128,
+            )
+        return self._Gihalfa
+
+    @Gihalfa.setter
+    def Gihalfa(self, value):
+        self._Gihalfa = value
+
+    @property
+    def Gihalfb(self):
+        if self._Gihalfb is None:
+            self._Gihalfb = numpy.zeros(
+                shape=(self.nwalkers, self.num_dets, self.ndown, self.nbasis),
+                dtype=numpy.complex128,
+            )
+        return self._Gihalfb
+
+    @Gihalfb.setter
+    def Gihalfb(self, value):
+        self._Gihalfb = value
@@ -38,22 +38,36 @@ from ipie.walkers.uhf_walkers import (
 )
 
 
-def get_initial_walker(trial: TrialWavefunctionBase) -> numpy.ndarray:
-    if isinstance(trial, SingleDet):
-        initial_walker = trial.psi.copy()
-        num_dets = 1
-    elif isinstance(trial, ParticleHole):
-        initial_walker = numpy.hstack([trial.psi0a, trial.psi0b])
-        num_dets = trial.num_dets
-    elif isinstance(trial, ParticleHoleNonChunked):
-        initial_walker = numpy.hstack([trial.psi0a, trial.psi0b])
-        num_dets = trial.num_dets
-    elif isinstance(trial, NOCI):
-        initial_walker = trial.psi[0].copy()
-        num_dets = trial.num_dets
-    else:
-        raise Exception("Unrecognized trial type in get_initial_walker")
-    return num_dets, initial_walker
+def _stack_spin_blocks(psi0a: numpy.ndarray, psi0b: numpy.ndarray) -> numpy.ndarray:
+    """Concatenate alpha and beta orbital blocks without the hstack temporary."""
+    nup = psi0a.shape[1]
+    psi0 = numpy.empty(
+        (psi0a.shape[0], nup + psi0b.shape[1]), dtype=numpy.result_type(psi0a, psi0b)
+    )
+    psi0[:, :nup] = psi0a
+    psi0[:, nup:] = psi0b
+    return psi0
+
+
+# initial walker dispatcher based on trial type
+@plum.dispatch
+def get_initial_walker(trial: SingleDet):
+    return 1, trial.psi.copy()
+
+
+@plum.dispatch
+def get_initial_walker(trial: ParticleHole):
+    return trial.num_dets, _stack_spin_blocks(trial.psi0a, trial.psi0b)
+
+
+@plum.dispatch
+def get_initial_walker(trial: NOCI):
+    return trial.num_dets, trial.psi[0].copy()
+
+
+@plum.dispatch
+def get_initial_walker(trial: TrialWavefunctionBase):
+    raise Exception("Unrecognized trial type in get_initial_walker")
 
 
 # walker dispatcher based on trial type